@@ -28,6 +28,6 @@ sls = SauerpodLogicStack(
 )
 sls.add_dependency(sps)
 slss = SauerpodPublishStackAlt(app, "sauerpod-publish-stack-alt")
-slss.add_dependency(sps)
+slss.add_dependency(sss)
 
 app.synth()
@@ -0,0 +1,23 @@
+import jsii
+from aws_cdk import aws_lambda_python_alpha as _lambda_python
+from typing import List
+
+
+@jsii.implements(_lambda_python.ICommandHooks)
+class SlimBundlingHooks:
+    """Removes files from the bundled dependencies that are never used at runtime and
+    pre-compiles the rest, as /opt is read-only and bytecode can't be cached there.
+    """
+
+    def before_bundling(self, input_dir: str, output_dir: str) -> List[str]:
+        return []
+
+    def after_bundling(self, input_dir: str, output_dir: str) -> List[str]:
+        return [
+            f"find {output_dir} -type d \\( -name __pycache__ -o -name tests -o -name test \\)"
+            " -prune -exec rm -rf {} +",
+            # provided by the Lambda runtime
+            f"rm -rf {output_dir}/boto3 {output_dir}/botocore {output_dir}/s3transfer",
+            # hash based, asset zips don't preserve source timestamps
+            f"python -m compileall -q --invalidation-mode unchecked-hash {output_dir}",
+        ]
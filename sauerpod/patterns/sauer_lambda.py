@@ -6,6 +6,9 @@ from aws_cdk import (
 from constructs import Construct
 from typing import List
 
+RUNTIME = _lambda.Runtime.PYTHON_3_12
+ARCHITECTURE = _lambda.Architecture.ARM_64
+
 
 class SauerLambda(Construct):
     def __init__(
@@ -15,27 +18,37 @@ class SauerLambda(Construct):
         code_path: str,
         handler: str,
         environment: dict,
-        managed_policies: List[str],
+        policy_statements: List[_iam.PolicyStatement] = None,
         layers=None,
         timeout_minutes: int = 1,
+        memory_size: int = None,
+        provisioned_concurrent_executions: int = None,
     ) -> None:
         super().__init__(scope, construct_id)
 
         self.function = _lambda.Function(
             self,
             id=construct_id,
-            runtime=_lambda.Runtime.PYTHON_3_9,
+            runtime=RUNTIME,
+            architecture=ARCHITECTURE,
             code=_lambda.Code.from_asset(code_path),
             handler=handler,
-            reserved_concurrent_executions=5,
             timeout=Duration.minutes(timeout_minutes),
+            memory_size=memory_size,
             environment=environment,
             layers=layers,
         )
         self.role = self.function.role
-        [
-            self.role.add_managed_policy(
-                _iam.ManagedPolicy.from_aws_managed_policy_name(policy_name)
+        self.alias = (
+            _lambda.Alias(
+                self,
+                "Live",
+                alias_name="live",
+                version=self.function.current_version,
+                provisioned_concurrent_executions=provisioned_concurrent_executions,
             )
-            for policy_name in managed_policies
-        ]
+            if provisioned_concurrent_executions
+            else None
+        )
+        for policy_statement in policy_statements or []:
+            self.function.add_to_role_policy(policy_statement)
@@ -4,17 +4,20 @@ from aws_cdk import (
     RemovalPolicy,
     Stack,
     aws_dynamodb as _ddb,
-    aws_apigateway as _aws_apigateway,
-    aws_lambda as _lambda,
+    aws_apigatewayv2 as _apigwv2,
+    aws_apigatewayv2_integrations as _apigwv2_integrations,
+    aws_iam as _iam,
     aws_lambda_python_alpha as _lambda_python,
-    aws_logs as _logs,
     aws_s3 as _s3,
     aws_ssm as _ssm,
     aws_stepfunctions as _sfn,
     aws_stepfunctions_tasks as _tasks,
 )
 from constructs import Construct
-from sauerpod.patterns.sauer_lambda import SauerLambda
+from sauerpod.patterns.bundling_hooks import SlimBundlingHooks
+from sauerpod.patterns.sauer_lambda import ARCHITECTURE, RUNTIME, SauerLambda
+
+ONE_VCPU_MEMORY_SIZE = 1769  # MB, Lambda allocates a full vCPU from here on
 
 
 class SauerpodLogicStack(Stack):
@@ -29,28 +32,23 @@ class SauerpodLogicStack(Stack):
         #
         # inputs
         #
-        distribution_domain_name = (
-            _ssm.StringParameter.from_string_parameter_attributes(
-                self,
-                "DistributionDomainNameSsm",
-                parameter_name="/sauerpod/aws/distribution_domain_name",
-            ).string_value
+        distribution_domain_name = _ssm.StringParameter.value_for_string_parameter(
+            self, "/sauerpod/aws/distribution_domain_name"
+        )
+        storage_bucket_name = _ssm.StringParameter.value_for_string_parameter(
+            self, "/sauerpod/aws/storage_bucket_name"
         )
-        storage_bucket_name = _ssm.StringParameter.from_string_parameter_attributes(
-            self,
-            "StorageBucketNameSsm",
-            parameter_name="/sauerpod/aws/storage_bucket_name",
-        ).string_value
         storage_bucket = _s3.Bucket.from_bucket_name(
             self, "storage_bucket", storage_bucket_name
         )
-        storage_table_name = _ssm.StringParameter.from_string_parameter_attributes(
+        storage_table_name = _ssm.StringParameter.value_for_string_parameter(
+            self, "/sauerpod/aws/storage_table_name"
+        )
+        storage_table = _ddb.Table.from_table_attributes(
             self,
-            "StorageTableNameSsm",
-            parameter_name="/sauerpod/aws/storage_table_name",
-        ).string_value
-        storage_table = _ddb.Table.from_table_name(
-            self, "storage_table", storage_table_name
+            "storage_table",
+            table_name=storage_table_name,
+            global_indexes=["EpisodeIdIndex"],
         )
 
         #
@@ -60,101 +58,71 @@ class SauerpodLogicStack(Stack):
             self,
             "CommonLayer",
             entry="src/commonlayer",
-            compatible_runtimes=[_lambda.Runtime.PYTHON_3_9],
+            compatible_runtimes=[RUNTIME],
+            compatible_architectures=[ARCHITECTURE],
+            bundling=_lambda_python.BundlingOptions(
+                asset_excludes=["__pycache__"],
+                command_hooks=SlimBundlingHooks(),
+            ),
             removal_policy=RemovalPolicy.DESTROY,
         )
 
+        read_telegram_parameters = _iam.PolicyStatement(
+            actions=["ssm:GetParameter", "ssm:GetParameters"],
+            resources=[
+                self.format_arn(
+                    service="ssm",
+                    resource="parameter",
+                    resource_name="sauerpod/telegram/*",
+                )
+            ],
+        )
+
         #
         # stepfunction lambdas
         #
-        dispatcher_lambda = SauerLambda(
-            self,
-            construct_id="DispatcherLambda",
-            code_path="src/dispatcher",
-            handler="dispatcher.dispatcher_handler",
-            environment={"LOGGING": "DEBUG"},
-            managed_policies=["AmazonSSMReadOnlyAccess"],
-            layers=[common_layer],
-        )
-
-        downloader_lambda = SauerLambda(
-            self,
-            construct_id="Downloader",
-            code_path="src/downloader",
-            handler="downloader.downloader_handler",
-            timeout_minutes=15,
-            environment={
-                "LOGGING": "DEBUG",
-                "STORAGE_BUCKET_NAME": storage_bucket_name,
-                "STORAGE_TABLE_NAME": storage_table_name,
-            },
-            managed_policies=["AmazonSSMReadOnlyAccess"],
-            layers=[common_layer],
-        )
-        storage_bucket.grant_read_write(downloader_lambda.function)
-        storage_table.grant_read_write_data(downloader_lambda.role)
-
-        commander_lambda = SauerLambda(
-            self,
-            construct_id="Commander",
-            code_path="src/commander",
-            handler="commander.commander_handler",
-            environment={
-                "LOGGING": "DEBUG",
-                "DISTRIBUTION_DOMAIN_NAME": distribution_domain_name,
-                "STORAGE_BUCKET_NAME": storage_bucket_name,
-                "STORAGE_TABLE_NAME": storage_table_name,
-            },
-            managed_policies=["AmazonSSMReadOnlyAccess"],
-            layers=[common_layer],
-        )
-        storage_bucket.grant_read_write(commander_lambda.function)
-        storage_table.grant_read_write_data(commander_lambda.role)
-
-        podcaster_lambda = SauerLambda(
-            self,
-            construct_id="Podcaster",
-            code_path="src/podcaster",
-            handler="podcaster.podcaster_handler",
-            environment={
-                "LOGGING": "DEBUG",
-                "DISTRIBUTION_DOMAIN_NAME": distribution_domain_name,
-                "STORAGE_BUCKET_NAME": storage_bucket_name,
-                "STORAGE_TABLE_NAME": storage_table_name,
-            },
-            managed_policies=["AmazonSSMReadOnlyAccess"],
-            layers=[common_layer],
-        )
-        storage_bucket.grant_read_write(podcaster_lambda.role)
-        storage_table.grant_read_data(podcaster_lambda.role)
+        storage_environment = {
+            "STORAGE_BUCKET_NAME": storage_bucket_name,
+            "STORAGE_TABLE_NAME": storage_table_name,
+        }
+        publish_environment = {
+            "DISTRIBUTION_DOMAIN_NAME": distribution_domain_name,
+            **storage_environment,
+        }
+        step_lambdas = {}
+        step_tasks = {}
+        for name, construct_id, environment, timeout_minutes, memory_size in (
+            ("dispatcher", "DispatcherLambda", {}, 1, ONE_VCPU_MEMORY_SIZE),
+            ("downloader", "Downloader", storage_environment, 15, ONE_VCPU_MEMORY_SIZE),
+            ("commander", "Commander", publish_environment, 1, None),
+            ("podcaster", "Podcaster", publish_environment, 1, None),
+        ):
+            step_lambdas[name] = SauerLambda(
+                self,
+                construct_id=construct_id,
+                code_path=f"src/{name}",
+                handler=f"{name}.{name}_handler",
+                timeout_minutes=timeout_minutes,
+                memory_size=memory_size,
+                environment={"LOGGING": "DEBUG", **environment},
+                policy_statements=[read_telegram_parameters],
+                layers=[common_layer],
+            )
+            step_tasks[name] = _tasks.LambdaInvoke(
+                self,
+                f"{name.capitalize()}Task",
+                lambda_function=step_lambdas[name].function,
+                output_path="$.Payload",
+            )
+        for name in ("downloader", "commander"):
+            storage_bucket.grant_read_write(step_lambdas[name].role)
+            storage_table.grant_read_write_data(step_lambdas[name].role)
+        storage_bucket.grant_read_write(step_lambdas["podcaster"].role)
+        storage_table.grant_read_data(step_lambdas["podcaster"].role)
 
         #
         # statemachine wiring
         #
-        dispatcher_step = _tasks.LambdaInvoke(
-            self,
-            "DispatcherTask",
-            lambda_function=dispatcher_lambda.function,
-            output_path="$.Payload",
-        )
-        commander_step = _tasks.LambdaInvoke(
-            self,
-            "CommanderTask",
-            lambda_function=commander_lambda.function,
-            output_path="$.Payload",
-        )
-        downloader_step = _tasks.LambdaInvoke(
-            self,
-            "DownloaderTask",
-            lambda_function=downloader_lambda.function,
-            output_path="$.Payload",
-        )
-        podcaster_step = _tasks.LambdaInvoke(
-            self,
-            "PodcasterTask",
-            lambda_function=podcaster_lambda.function,
-            output_path="$.Payload",
-        )
         job_succeeded = _sfn.Succeed(self, "Succeeded", comment="succeeded")
         job_failed = _sfn.Fail(self, "Failed", comment="failed")
 
@@ -163,29 +131,29 @@ class SauerpodLogicStack(Stack):
             .when(_sfn.Condition.string_equals("$.status", "FINISH"), job_succeeded)\
             .otherwise(job_failed)
         choice_downloader = _sfn.Choice(self, "Downloading Result?")\
-            .when(_sfn.Condition.string_equals("$.status", "PODCASTER"), podcaster_step)\
+            .when(_sfn.Condition.string_equals("$.status", "PODCASTER"), step_tasks["podcaster"])\
             .when(_sfn.Condition.string_equals("$.status", "FINISH"), job_succeeded)\
             .otherwise(job_failed)
         choice_commander = _sfn.Choice(self, "Commander?")\
-            .when(_sfn.Condition.string_equals("$.status", "PODCASTER"), podcaster_step)\
+            .when(_sfn.Condition.string_equals("$.status", "PODCASTER"), step_tasks["podcaster"])\
             .when(_sfn.Condition.string_equals("$.status", "FINISH"), job_succeeded)\
             .otherwise(job_failed)
         choice_dispatcher = _sfn.Choice(self, "Dispatching Result?")\
-            .when(_sfn.Condition.string_equals("$.status", "DOWNLOADER"), downloader_step)\
-            .when(_sfn.Condition.string_equals("$.status", "COMMANDER"), commander_step)\
+            .when(_sfn.Condition.string_equals("$.status", "DOWNLOADER"), step_tasks["downloader"])\
+            .when(_sfn.Condition.string_equals("$.status", "COMMANDER"), step_tasks["commander"])\
             .when(_sfn.Condition.string_equals("$.status", "FINISH"), job_succeeded)\
             .otherwise(job_failed)
         # fmt: on
 
-        dispatcher_step.next(choice_dispatcher)
-        commander_step.next(choice_commander)
-        downloader_step.next(choice_downloader)
-        podcaster_step.next(choice_podcaster)
+        step_tasks["dispatcher"].next(choice_dispatcher)
+        step_tasks["commander"].next(choice_commander)
+        step_tasks["downloader"].next(choice_downloader)
+        step_tasks["podcaster"].next(choice_podcaster)
 
         #
         # state machine
         #
-        definition = _sfn.Chain.start(dispatcher_step)
+        definition = _sfn.Chain.start(step_tasks["dispatcher"])
         state_machine = _sfn.StateMachine(
             self, "StateMachine", definition=definition, timeout=Duration.minutes(15)
         )
@@ -202,33 +170,27 @@ class SauerpodLogicStack(Stack):
                 "LOGGING": "DEBUG",
                 "STATE_MACHINE_ARN": state_machine.state_machine_arn,
             },
-            managed_policies=["AmazonSSMReadOnlyAccess"],
+            policy_statements=[read_telegram_parameters],
             layers=[common_layer],
+            provisioned_concurrent_executions=1,
         )
         state_machine.grant_start_execution(bouncer_lambda.role)
 
         #
         # bouncer API
         #
-        sauerpod_api_logs = _logs.LogGroup(self, "ApiLogs")
-
-        sauerpod_api = _aws_apigateway.RestApi(
+        sauerpod_api = _apigwv2.HttpApi(
             self,
-            "SauerPodApi",
-            rest_api_name="SauerPodApi",
-            deploy_options=_aws_apigateway.StageOptions(
-                access_log_destination=_aws_apigateway.LogGroupLogDestination(
-                    sauerpod_api_logs
-                ),
-                access_log_format=_aws_apigateway.AccessLogFormat.clf(),
+            "SauerPodHttpApi",
+            api_name="SauerPodApi",
+        )
+        sauerpod_api.add_routes(
+            path="/sauerpod",
+            methods=[_apigwv2.HttpMethod.POST],
+            integration=_apigwv2_integrations.HttpLambdaIntegration(
+                "BouncerIntegration", bouncer_lambda.alias
             ),
         )
-        sauerpod_resource = sauerpod_api.root.add_resource("sauerpod")
-
-        bouncer_lambda_integration = _aws_apigateway.LambdaIntegration(
-            bouncer_lambda.function
-        )
-        sauerpod_resource.add_method("POST", bouncer_lambda_integration)
 
         #
         # stack outputs
@@ -1,5 +1,6 @@
 from aws_cdk import (
     CfnOutput,
+    Duration,
     Stack,
     aws_cloudfront as _cloudfront,
     aws_cloudfront_origins as _origins,
@@ -22,20 +23,50 @@ class SauerpodPublishStack(Stack):
         #
         # cloudfront distribution
         #
+        storage_origin = _origins.S3Origin(storage_bucket)
+        rss_cache_policy = _cloudfront.CachePolicy(
+            self,
+            "RssCache",
+            default_ttl=Duration.seconds(60),  # same window as the feed's max-age=60
+            min_ttl=Duration.seconds(60),
+            max_ttl=Duration.minutes(15),
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+        )
+        rss_headers_policy = _cloudfront.ResponseHeadersPolicy(
+            self,
+            "RssHeaders",
+            custom_headers_behavior=_cloudfront.ResponseCustomHeadersBehavior(
+                custom_headers=[
+                    _cloudfront.ResponseCustomHeader(
+                        header="Cache-Control",
+                        value="public, s-maxage=60",
+                        override=True,
+                    )
+                ]
+            ),
+        )
         self.distribution = _cloudfront.Distribution(
             self,
             "cloudfront_distribution",
             default_behavior=_cloudfront.BehaviorOptions(
-                origin=_origins.S3Origin(storage_bucket),
+                origin=storage_origin,
+                cache_policy=_cloudfront.CachePolicy.CACHING_OPTIMIZED,
+                compress=True,
                 viewer_protocol_policy=_cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
             ),
             additional_behaviors={
                 "/*.rss": _cloudfront.BehaviorOptions(
-                    origin=_origins.S3Origin(storage_bucket),
-                    cache_policy=_cloudfront.CachePolicy.CACHING_DISABLED,
+                    origin=storage_origin,
+                    cache_policy=rss_cache_policy,
+                    response_headers_policy=rss_headers_policy,
+                    compress=True,
                 )
             },
             default_root_object="index.html",
+            price_class=_cloudfront.PriceClass.PRICE_CLASS_ALL,
+            http_version=_cloudfront.HttpVersion.HTTP2_AND_3,
+            enable_ipv6=True,
         )
 
         #
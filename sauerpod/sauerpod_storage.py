@@ -12,6 +12,8 @@ from constructs import Construct
 class SauerpodStorageStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        is_prod = self.node.try_get_context("env") == "prod"
+        removal_policy = RemovalPolicy.RETAIN if is_prod else RemovalPolicy.DESTROY
 
         #
         # storage bucket
@@ -20,11 +22,11 @@ class SauerpodStorageStack(Stack):
         bucket = _s3.Bucket(
             self,
             "StorageBucket",
-            auto_delete_objects=True,
+            auto_delete_objects=not is_prod,
             bucket_name=bucket_name,
             block_public_access=_s3.BlockPublicAccess.BLOCK_ALL,
             encryption=_s3.BucketEncryption.S3_MANAGED,
-            removal_policy=RemovalPolicy.DESTROY,
+            removal_policy=removal_policy,
         )
         self.storage_bucket = bucket
 
@@ -41,7 +43,16 @@ class SauerpodStorageStack(Stack):
             billing_mode=_ddb.BillingMode.PROVISIONED,
             read_capacity=1,
             write_capacity=1,
-            removal_policy=RemovalPolicy.DESTROY,
+            removal_policy=removal_policy,
+        )
+        self.storage_table.add_global_secondary_index(
+            index_name="EpisodeIdIndex",
+            partition_key=_ddb.Attribute(name="FeedId", type=_ddb.AttributeType.STRING),
+            sort_key=_ddb.Attribute(name="EpisodeId", type=_ddb.AttributeType.STRING),
+            projection_type=_ddb.ProjectionType.INCLUDE,
+            non_key_attributes=["BucketPathEpisode", "BucketPathThumbnail"],
+            read_capacity=1,
+            write_capacity=1,
         )
 
         #
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Runs a command through the commander against the deployed stacks.
+
+Usage: ./scripts/run-commander-locally.py ["/list"]
+"""
+
+import boto3
+import os
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+sys.path[:0] = [str(SRC_PATH / "commander"), str(SRC_PATH / "commonlayer")]
+
+
+def get_stack_output(stack_name, output_key):
+    stack_outputs = boto3.client("cloudformation").describe_stacks(
+        StackName=stack_name
+    )["Stacks"][0]["Outputs"]
+    return next(
+        output["OutputValue"]
+        for output in stack_outputs
+        if output["OutputKey"] == output_key
+    )
+
+
+if __name__ == "__main__":
+    os.environ["STORAGE_TABLE_NAME"] = get_stack_output(
+        "sauerpod-storage-stack", "StorageTableNameCfn"
+    )
+    os.environ["STORAGE_BUCKET_NAME"] = get_stack_output(
+        "sauerpod-storage-stack", "StorageBucketNameCfn"
+    )
+    os.environ["DISTRIBUTION_DOMAIN_NAME"] = get_stack_output(
+        "sauerpod-publish-stack", "DistributionDomainNameCfn"
+    )
+    from commander import COMMANDER  # built at import time, needs the environment
+
+    event = dict(
+        message=dict(
+            sender_name="foo",
+            incoming_text=sys.argv[1] if len(sys.argv) > 1 else "/list",
+            chat_id="173229021",
+        )
+    )
+    print(COMMANDER.handle_event(event))
@@ -1,16 +1,17 @@
-import boto3
-import json
 import logging
+import orjson
 import os
 from common import (
+    get_sfn_client,
+    get_telegram_parameters,
     notify_cloudwatch,
     UnknownChatIdException,
-    SSM_PATH_TELEGRAM_CHAT_ID,
 )
 
+
 class Bouncer:
     """Handles initial invocation from Telegram's webhook:
-    * Basic sanity check of incoming message
+    * Basic sanity check of incoming message (only text messages are processed)
     * Validate chat id (only allow specific chat id)
     * Kick off state machine
     * Ackknowledge Telegram with 200 response, regardless of the outcome (required by Telegram's API)
@@ -19,18 +20,18 @@ class Bouncer:
     def __init__(self) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(os.environ.get("LOGGING", logging.DEBUG))
-        self.sfn_client = boto3.client("stepfunctions")
-        self.ssm_client = boto3.client("ssm")
-        self.allowed_chat_id = self.ssm_client.get_parameter(
-            Name=SSM_PATH_TELEGRAM_CHAT_ID
-        )["Parameter"]["Value"]
+        self.sfn_client = get_sfn_client()
+        get_telegram_parameters()  # fetch from SSM now instead of on the first request
 
     def _extract_incoming_message(self, event):
-        return json.loads(event["body"])
+        return orjson.loads(event["body"])
+
+    def _is_text_message(self, incoming_message):
+        return "text" in incoming_message.get("message", {})
 
     def _verify_chat_id(self, incoming_message):
         incoming_chat_id = str(incoming_message["message"]["chat"]["id"])
-        if incoming_chat_id != self.allowed_chat_id:
+        if incoming_chat_id != get_telegram_parameters().chat_id:
             msg = f"Chat id '{incoming_chat_id}' not allowed."
             self.logger.info(msg)
             raise UnknownChatIdException(msg)
@@ -46,22 +47,30 @@ class Bouncer:
 
     def _start_state_machine(self, payload):
         response = self.sfn_client.start_execution(
-            stateMachineArn=os.environ["STATE_MACHINE_ARN"], input=json.dumps(payload)
+            stateMachineArn=os.environ["STATE_MACHINE_ARN"],
+            input=orjson.dumps(payload).decode(),
         )
-        self.logger.info(f"Starting state machine: '{response['executionArn']}'")
+        self.logger.info("Starting state machine: '%s'", response["executionArn"])
 
     def _get_return_message(self, message, status_code=200):
-        return {"statusCode": status_code, "body": json.dumps({"message": message})}
+        return {
+            "statusCode": status_code,
+            "body": orjson.dumps({"message": message}).decode(),
+        }
 
     def handle_event(self, event):
         try:
             incoming_message = self._extract_incoming_message(event)
-            self._verify_chat_id(incoming_message)
-            payload = self._create_payload(incoming_message)
-            self._start_state_machine(payload)
-            result = self._get_return_message(
-                message="Event received, state machine started."
-            )
+            if self._is_text_message(incoming_message):
+                self._verify_chat_id(incoming_message)
+                payload = self._create_payload(incoming_message)
+                self._start_state_machine(payload)
+                result = self._get_return_message(
+                    message="Event received, state machine started."
+                )
+            else:
+                self.logger.debug("Ignoring non-text update: %s", incoming_message)
+                result = self._get_return_message(message="Event ignored.")
         except UnknownChatIdException:
             # Swallow stack trace. Return 200 to acknowledge & prevent telegram from resending.
             result = self._get_return_message(message="403 - private bot")
@@ -74,6 +83,11 @@ class Bouncer:
         return result
 
 
+# Built during the init phase, so provisioned environments are ready before the
+# first webhook arrives.
+BOUNCER = Bouncer()
+
+
 @notify_cloudwatch
 def bouncer_handler(event, context) -> dict:
-    return Bouncer().handle_event(event)
+    return BOUNCER.handle_event(event)
@@ -1,11 +1,21 @@
-import boto3
 import logging
 import os
 import textwrap
 import time
 from boto3.dynamodb.conditions import Attr, Key
-from common import TelegramNotifier, Payload, Status, notify_cloudwatch
-from datetime import timedelta
+from common import (
+    EPISODE_ID_INDEX,
+    get_dynamodb_resource,
+    get_s3_resource,
+    notify_cloudwatch,
+    Payload,
+    projection,
+    query_all,
+    Status,
+    TelegramNotifier,
+)
+
+LIST_ATTRIBUTES = ("EpisodeId", "Title", "TimestampUtc", "BucketPathEpisode")
 
 
 class Commander:
@@ -16,44 +26,66 @@ class Commander:
         self.logger.setLevel(os.environ.get("LOGGING", logging.DEBUG))
         self.telegram = TelegramNotifier()
         self.storage_bucket_name = os.environ["STORAGE_BUCKET_NAME"]
-        self.storage_bucket = boto3.resource("s3").Bucket(self.storage_bucket_name)
+        self.storage_bucket = get_s3_resource().Bucket(self.storage_bucket_name)
         self.storage_table_name = os.environ["STORAGE_TABLE_NAME"]
-        self.storage_table = boto3.resource("dynamodb").Table(self.storage_table_name)
+        self.storage_table = get_dynamodb_resource().Table(self.storage_table_name)
         self.base_url = f'https://{os.environ["DISTRIBUTION_DOMAIN_NAME"]}'
 
-    def _convert_to_line_item(self, episode: dict, now: float, compact: bool) -> str:
+    def _format_age(self, seconds: int) -> str:
+        """Same layout as str(timedelta(seconds=seconds)), without the object."""
+        days, seconds = divmod(seconds, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        minutes, seconds = divmod(seconds, 60)
+        clock = f"{hours}:{minutes:02}:{seconds:02}"
+        if days:
+            return f"{days} day{'' if abs(days) == 1 else 's'}, {clock}"
+        return clock
+
+    def _convert_to_line_item(self, episode: dict, now: int, compact: bool) -> str:
         title = (
             (episode["Title"][:25] + "..")
             if len(episode["Title"]) > 27 and compact
             else episode["Title"]
         )
-        age = timedelta(seconds=int(now - int(episode["TimestampUtc"])))
+        age = self._format_age(now - int(episode["TimestampUtc"]))
         episode_link = f"<a href='{self.base_url}/{episode['BucketPathEpisode']}'>{episode['EpisodeId']}</a>"
         return f"* <i>{title}</i> ({episode_link}, <b>-{age}</b>) "
 
-    def _query_episodes(self, feed_id: str, ascending: bool, limit: int = None) -> dict:
-        kwargs = {
-            "KeyConditionExpression": Key("FeedId").eq(feed_id),
-            "ScanIndexForward": ascending,
-        }
-        if limit:
-            kwargs["Limit"] = limit
-        return self.storage_table.query(**kwargs)["Items"]
+    def _query_episodes(
+        self,
+        feed_id: str,
+        ascending: bool,
+        limit: int = None,
+        attributes: tuple = LIST_ATTRIBUTES,
+    ) -> list:
+        return query_all(
+            self.storage_table,
+            limit=limit,
+            KeyConditionExpression=Key("FeedId").eq(feed_id),
+            ScanIndexForward=ascending,
+            **projection(*attributes),
+        )
 
     def _delete_episode(self, chat_id, episode_id) -> str:
         try:
             episode = next(
-                episode
-                for episode in self.storage_table.query(
-                    KeyConditionExpression=Key("FeedId").eq(chat_id),
-                    FilterExpression=Key("EpisodeId").eq(episode_id),
-                )["Items"]
-            )
-            self.storage_bucket.delete_objects(
-                Delete={"Objects": [{"Key": episode["BucketPathThumbnail"]}]}
+                iter(
+                    self.storage_table.query(
+                        IndexName=EPISODE_ID_INDEX,
+                        KeyConditionExpression=Key("FeedId").eq(chat_id)
+                        & Key("EpisodeId").eq(episode_id),
+                        Limit=1,
+                    )["Items"]
+                )
             )
             self.storage_bucket.delete_objects(
-                Delete={"Objects": [{"Key": episode["BucketPathEpisode"]}]}
+                Delete={
+                    "Objects": [
+                        {"Key": episode["BucketPathThumbnail"]},
+                        {"Key": episode["BucketPathEpisode"]},
+                    ],
+                    "Quiet": True,
+                }
             )
             self.storage_table.delete_item(
                 Key={"FeedId": chat_id, "TimestampUtc": episode["TimestampUtc"]},
@@ -64,26 +96,39 @@ class Commander:
             result = f"Couldn't find episode <pre>{episode_id}</pre> in database. Is this the right id?"
         return result
 
-    def _cmd_list(self, command, chat_id) -> None:
-        now = time.time()
-        result = [
-            self._convert_to_line_item(episode, now, not command.endswith("full"))
-            for episode in self._query_episodes(feed_id=chat_id, ascending=False)
-        ]
-        self.telegram.send("\n".join(result))
+    def _cmd_list(self, command, chat_id) -> Status:
+        command_fragments = command.split()
+        limit = command_fragments[1] if len(command_fragments) == 2 else None
+        if len(command_fragments) > 2 or not (
+            limit is None or (limit.isdecimal() and int(limit) > 0)
+        ):
+            self.telegram.send(f"I don't understand '{command}'.")
+            return Status.FINISH
+        limit = int(limit) if limit else None
+        now = int(time.time())
+        compact = command_fragments[0] != "/listfull"
+        self.telegram.send(
+            "\n".join(
+                self._convert_to_line_item(episode, now, compact)
+                for episode in self._query_episodes(
+                    feed_id=chat_id, ascending=False, limit=limit
+                )
+            )
+        )
+        return Status.FINISH
 
-    def _cmd_delete(self, command, chat_id) -> bool:
+    def _cmd_delete(self, command, chat_id) -> Status:
         try:
             command_fragments = command.split()
             command_text = command_fragments[0]
             if command_text == "/deletenewest":
-                episode_id = self._query_episodes(feed_id=chat_id, ascending=False)[0][
-                    "EpisodeId"
-                ]
+                episode_id = self._query_episodes(
+                    feed_id=chat_id, ascending=False, limit=1, attributes=("EpisodeId",)
+                )[0]["EpisodeId"]
             elif command_text == "/deleteoldest":
-                episode_id = self._query_episodes(feed_id=chat_id, ascending=True)[0][
-                    "EpisodeId"
-                ]
+                episode_id = self._query_episodes(
+                    feed_id=chat_id, ascending=True, limit=1, attributes=("EpisodeId",)
+                )[0]["EpisodeId"]
             elif len(command_fragments) == 2:
                 episode_id = command_fragments[1]
             else:
@@ -94,39 +139,45 @@ class Commander:
             message = f"I don't understand '{command}'."
             update_required = False
         self.telegram.send(message)
-        return update_required
+        return Status.PODCASTER if update_required else Status.FINISH
 
-    def _cmd_help(self):
+    def _cmd_help(self, command, chat_id) -> Status:
         self.telegram.send(
             textwrap.dedent(
                 f"""\
                 I understand these commands:
                 <pre> {'/help':<20}</pre>This text.
-                <pre> {'/list':<20}</pre>List entries in database (compact layout).
-                <pre> {'/listfull':<20}</pre>List entries in database (full layout).
+                <pre> {'/list [n]':<20}</pre>List newest entries in database (compact layout).
+                <pre> {'/listfull [n]':<20}</pre>List newest entries in database (full layout).
                 <pre> {'/delete [id]':<20}</pre>Delete entry from database.
                 <pre> {'/deletenewest':<20}</pre>Delete newest entry from database.
                 <pre> {'/deleteoldest':<20}</pre>Delete oldest entry from database.
                 """
             ),
         )
+        return Status.FINISH
+
+    def _cmd_unknown(self, command, chat_id) -> Status:
+        self.telegram.send(f"I don't understand '{command}'. Try /help.")
+        return Status.FINISH
+
+    COMMANDS = {
+        "/help": _cmd_help,
+        "/list": _cmd_list,
+        "/listfull": _cmd_list,
+        "/delete": _cmd_delete,
+        "/deletenewest": _cmd_delete,
+        "/deleteoldest": _cmd_delete,
+    }
 
     def handle_event(self, event: dict):
         try:
-            self.logger.info(f"{self.__class__.__name__} - called with {event}")
+            self.logger.info("%s - called with %s", self.__class__.__name__, event)
             payload = Payload(**event["message"])
             command = payload.incoming_text
-            if command.startswith("/list"):
-                self._cmd_list(command=command, chat_id=payload.chat_id)
-                status = Status.FINISH
-            if command.startswith("/delete"):
-                update_required = self._cmd_delete(
-                    command=command, chat_id=payload.chat_id
-                )
-                status = Status.PODCASTER if update_required else Status.FINISH
-            elif command.startswith("/help"):
-                self._cmd_help()
-                status = Status.FINISH
+            command_name = next(iter(command.split(maxsplit=1)), "")
+            handler = self.COMMANDS.get(command_name, Commander._cmd_unknown)
+            status = handler(self, command=command, chat_id=payload.chat_id)
         except Exception as e:
             self.logger.exception(e)
             self.telegram.send(f"⚠️ Error:\n{e}")
@@ -134,42 +185,9 @@ class Commander:
         return dict(status=status.name, message=event["message"])
 
 
+COMMANDER = Commander()
+
+
 @notify_cloudwatch
 def commander_handler(event, context) -> dict:
-    return Commander().handle_event(event)
-
-
-if __name__ == "__main__":
-    stack_outputs = boto3.client("cloudformation").describe_stacks(
-        StackName="sauerpod-storage-stack"
-    )["Stacks"][0]["Outputs"]
-    bucket_name = next(
-        output["OutputValue"]
-        for output in stack_outputs
-        if output["OutputKey"] == "StorageBucketNameCfn"
-    )
-    table_name = next(
-        output["OutputValue"]
-        for output in stack_outputs
-        if output["OutputKey"] == "StorageTableNameCfn"
-    )
-    stack_outputs = boto3.client("cloudformation").describe_stacks(
-        StackName="sauerpod-publish-stack"
-    )["Stacks"][0]["Outputs"]
-    domain_name = next(
-        output["OutputValue"]
-        for output in stack_outputs
-        if output["OutputKey"] == "DistributionDomainNameCfn"
-    )
-    os.environ["STORAGE_TABLE_NAME"] = table_name
-    os.environ["STORAGE_BUCKET_NAME"] = bucket_name
-    os.environ["DISTRIBUTION_DOMAIN_NAME"] = domain_name
-    event = dict(
-        message=dict(
-            sender_name="foo",
-            incoming_text="/deletefirst",
-            chat_id="173229021",
-        )
-    )
-    payload = Payload(**event["message"])
-    Commander().handle_event(event)
+    return COMMANDER.handle_event(event)
@@ -1,9 +1,17 @@
 from collections import namedtuple
+from dataclasses import dataclass
 from enum import Enum, auto
+from functools import lru_cache
 import boto3
 import logging
+import orjson
+import re
 import requests
 import os
+import time
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s")
 logger = logging.getLogger("common")
@@ -12,32 +20,70 @@ logger.setLevel(os.environ.get("LOGGING", logging.DEBUG))
 
 SSM_PATH_TELEGRAM_API_TOKEN = "/sauerpod/telegram/api-token"
 SSM_PATH_TELEGRAM_CHAT_ID = "/sauerpod/telegram/chat-id"
+EPISODE_ID_INDEX = "EpisodeIdIndex"
+SSM_CACHE_TTL_SECONDS = 300
+# (www.|m.)youtube.com/watch?v=<id>, youtube.com/(shorts|live|embed)/<id>, youtu.be/<id>
+YOUTUBE_URL_PATTERN = re.compile(
+    r"^https://(?:(?:(?:www|m)\.)?youtube\.com/"
+    r"(?:watch\?(?:[^&#]*&)*v=|shorts/|live/|embed/)|youtu\.be/)"
+    r"(?P<video_id>[\w-]{11})(?:[?&#/].*)?$"
+)
 
-
-VideoInformation = namedtuple(
-    "VideoInformation",
-    [
-        "video_id",
-        "title",
-        "author",
-        "description",
-        "thumbnail_url",
-        "duration_in_seconds",
-        "keywords",
-        "source_url",
-    ],
+# Shared across invocations of a warm Lambda container, keeps connections alive.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,  # api.telegram.org and the thumbnail host
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # Telegram sends are POSTs; a rare duplicate message beats a lost one.
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        ),
+    ),
 )
-UploadInformation = namedtuple(
-    "UploadInformation",
-    [
-        "path_to_episode",
-        "path_to_thumbnail",
-        "timestamp_utc",
-        "timestamp_rfc822",
-        "episode_size",
-    ],
+
+# Shared by all boto3 clients, keeps idle connections to AWS endpoints alive.
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=10,
+    retries={"max_attempts": 3, "mode": "standard"},
 )
-Payload = namedtuple("Payload", ["sender_name", "incoming_text", "chat_id"])
+
+
+@dataclass(frozen=True, slots=True)
+class VideoInformation:
+    video_id: str
+    title: str
+    author: str
+    description: str
+    thumbnail_url: str
+    duration_in_seconds: int
+    keywords: list
+    source_url: str
+
+
+@dataclass(frozen=True, slots=True)
+class UploadInformation:
+    path_to_episode: str
+    path_to_thumbnail: str
+    timestamp_utc: int
+    timestamp_rfc822: str
+    episode_size: int
+
+
+@dataclass(frozen=True, slots=True)
+class Payload:
+    sender_name: str
+    incoming_text: str
+    chat_id: str
+
+
+TelegramParameters = namedtuple("TelegramParameters", ["api_token", "chat_id"])
 
 
 class Status(Enum):
@@ -52,19 +98,91 @@ class UnknownChatIdException(Exception):
     pass
 
 
+@lru_cache(maxsize=None)
+def get_ssm_client():
+    """Shared SSM client, created once per container."""
+    return boto3.client("ssm", config=BOTO_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def get_sfn_client():
+    """Shared Step Functions client, created once per container."""
+    return boto3.client("stepfunctions", config=BOTO_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def get_s3_resource():
+    """Shared S3 resource, created once per container."""
+    # room for concurrent multipart uploads next to other requests
+    return boto3.resource(
+        "s3", config=BOTO_CONFIG.merge(Config(max_pool_connections=25))
+    )
+
+
+@lru_cache(maxsize=None)
+def get_dynamodb_resource():
+    """Shared DynamoDB resource, created once per container."""
+    return boto3.resource("dynamodb", config=BOTO_CONFIG)
+
+
+def get_telegram_parameters() -> TelegramParameters:
+    """Reads Telegram parameters from SSM, reusing them for SSM_CACHE_TTL_SECONDS."""
+    return _read_telegram_parameters(int(time.monotonic() // SSM_CACHE_TTL_SECONDS))
+
+
+@lru_cache(maxsize=1)
+def _read_telegram_parameters(ttl_bucket: int) -> TelegramParameters:
+    """Reads Telegram parameters from SSM in a single call, cached per ttl_bucket."""
+    parameters = {
+        parameter["Name"]: parameter["Value"]
+        for parameter in get_ssm_client().get_parameters(
+            Names=[SSM_PATH_TELEGRAM_API_TOKEN, SSM_PATH_TELEGRAM_CHAT_ID],
+            WithDecryption=True,
+        )["Parameters"]
+    }
+    return TelegramParameters(
+        api_token=parameters[SSM_PATH_TELEGRAM_API_TOKEN],
+        chat_id=parameters[SSM_PATH_TELEGRAM_CHAT_ID],
+    )
+
+
+def projection(*attribute_names: str) -> dict:
+    """Query kwargs that only return the given attributes, safe for reserved words."""
+    return {
+        "ProjectionExpression": ", ".join(f"#{name}" for name in attribute_names),
+        "ExpressionAttributeNames": {f"#{name}": name for name in attribute_names},
+    }
+
+
+def query_all(table, limit: int = None, **kwargs) -> list:
+    """Follows LastEvaluatedKey until the query is exhausted or limit items are read."""
+    items = []
+    while limit is None or len(items) < limit:
+        if limit is not None:
+            kwargs["Limit"] = limit - len(items)
+        response = table.query(**kwargs)
+        items.extend(response["Items"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return items
+
+
 class TelegramNotifier:
     TELEGRAM_URL: str = "https://api.telegram.org/bot{api_token}/{method}"
+    TELEGRAM_TIMEOUT: tuple = (1.0, 3.0)  # (connect, read) in seconds
+    TELEGRAM_HEADERS: dict = {"Content-Type": "application/json"}
 
     def __init__(self) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(os.environ.get("LOGGING", logging.DEBUG))
-        self.ssm_client = boto3.client("ssm")
-        self.api_token = self.ssm_client.get_parameter(
-            Name=SSM_PATH_TELEGRAM_API_TOKEN, WithDecryption=True
-        )["Parameter"]["Value"]
-        self.chat_id = self.ssm_client.get_parameter(Name=SSM_PATH_TELEGRAM_CHAT_ID)[
-            "Parameter"
-        ]["Value"]
+        get_telegram_parameters()  # fetch from SSM now instead of on the first send
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _url(api_token: str, method: str) -> str:
+        """Formatted once per token, a rotated token gets new URLs."""
+        return TelegramNotifier.TELEGRAM_URL.format(api_token=api_token, method=method)
 
     def send(
         self,
@@ -73,41 +191,44 @@ class TelegramNotifier:
         disable_web_page_preview=True,
         disable_notification=True,
     ) -> None:
-        self.logger.debug(f"Sending:\n{text}")
+        self.logger.debug("Sending:\n%s", text)
+        telegram_parameters = get_telegram_parameters()
         # https://core.telegram.org/bots/api#sendmessage
-        response = requests.post(
-            url=self.TELEGRAM_URL.format(
-                api_token=self.api_token, method="sendmessage"
+        response = HTTP_SESSION.post(
+            url=self._url(telegram_parameters.api_token, "sendmessage"),
+            data=orjson.dumps(
+                {
+                    "chat_id": telegram_parameters.chat_id,
+                    "parse_mode": parse_mode,
+                    "disable_web_page_preview": disable_web_page_preview,
+                    "disable_notification": disable_notification,
+                    "text": text,
+                }
             ),
-            data={
-                "chat_id": self.chat_id,
-                "parse_mode": parse_mode,
-                "disable_web_page_preview": disable_web_page_preview,
-                "disable_notification": disable_notification,
-                "text": text,
-            },
+            headers=self.TELEGRAM_HEADERS,
+            timeout=self.TELEGRAM_TIMEOUT,
         )
         self.logger.debug(
-            f"Sent message, response status: {response.status_code}\n{response.json()}"
+            "Sent message, response status: %s\n%s", response.status_code, response.text
         )
         response.raise_for_status()
-        if disable_notification:
-            self.send_chat_action()
 
     def send_chat_action(self, action="typing"):
-        self.logger.debug(f"Sending chat action {action}")
+        self.logger.debug("Sending chat action %s", action)
+        telegram_parameters = get_telegram_parameters()
         # https://core.telegram.org/bots/api#sendchataction
-        response = requests.post(
-            url=self.TELEGRAM_URL.format(
-                api_token=self.api_token, method="sendchataction"
+        response = HTTP_SESSION.post(
+            url=self._url(telegram_parameters.api_token, "sendchataction"),
+            data=orjson.dumps(
+                {"chat_id": telegram_parameters.chat_id, "action": action}
             ),
-            data={
-                "chat_id": self.chat_id,
-                "action": action,
-            },
+            headers=self.TELEGRAM_HEADERS,
+            timeout=self.TELEGRAM_TIMEOUT,
         )
         self.logger.debug(
-            f"Sent chat action, response status: {response.status_code}\n{response.json()}"
+            "Sent chat action, response status: %s\n%s",
+            response.status_code,
+            response.text,
         )
         response.raise_for_status()
 
@@ -116,9 +237,11 @@ def notify_cloudwatch(function):
     def wrapper(*args, **kwargs):
         incoming_event = args[0]  # ...event
         function_name = args[1].function_name
-        logger.info(f"'{function_name}' - entry.\nIncoming event: '{incoming_event}'")
+        logger.info(
+            "'%s' - entry.\nIncoming event: '%s'", function_name, incoming_event
+        )
         result = function(*args, **kwargs)
-        logger.info(f"'{function_name}' - exit.\n\nResult: '{result}'")
+        logger.info("'%s' - exit.\n\nResult: '%s'", function_name, result)
         return result
 
     return wrapper
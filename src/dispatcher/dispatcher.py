@@ -1,6 +1,14 @@
 import logging
 import os
-from common import Payload, Status, TelegramNotifier, notify_cloudwatch
+from common import (
+    notify_cloudwatch,
+    Payload,
+    Status,
+    TelegramNotifier,
+    YOUTUBE_URL_PATTERN,
+)
+
+REPLY_TEMPLATE = "Hello %s, you said '%s'.\n\n%s"
 
 
 class Dispatcher:
@@ -13,30 +21,28 @@ class Dispatcher:
 
     def _send_telegram(self, sender_name, incoming_text, response_text):
         self.telegram.send(
-            text=f"Hello {sender_name}, you said '{incoming_text}'.\n\n{response_text}",
+            text=REPLY_TEMPLATE % (sender_name, incoming_text, response_text),
         )
 
     def _is_video_url(self, text):
-        return (
-            text.startswith("https://youtu.be")
-            or text.startswith("https://www.youtube.com")
-            or text.startswith("https://youtube.com")
-        )
+        return YOUTUBE_URL_PATTERN.match(text) is not None
 
     def _is_command(self, text):
         return text.startswith("/")
 
     def handle_event(self, event):
         try:
-            self.logger.info(f"{self.__class__.__name__} - called with {event}")
+            self.logger.info("%s - called with %s", self.__class__.__name__, event)
             payload = Payload(**event["message"])
             if self._is_video_url(payload.incoming_text):
                 status = Status.DOWNLOADER
             elif self._is_command(payload.incoming_text):
                 status = Status.COMMANDER
             else:
-                self.telegram.send(
-                    text=f"Hello {payload.sender_name}, you said '{payload.incoming_text}'.\n\nI don't know what to do with that.",
+                self._send_telegram(
+                    sender_name=payload.sender_name,
+                    incoming_text=payload.incoming_text,
+                    response_text="I don't know what to do with that.",
                 )
                 status = Status.FINISH
         except Exception as e:
@@ -46,6 +52,9 @@ class Dispatcher:
         return dict(status=status.name, message=event["message"])
 
 
+DISPATCHER = Dispatcher()
+
+
 @notify_cloudwatch
 def dispatcher_handler(event, context) -> dict:
-    return Dispatcher().handle_event(event)
+    return DISPATCHER.handle_event(event)
@@ -1,9 +1,14 @@
-import boto3
 import email
+import io
 import logging
 import os
-from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.conditions import Key
+from boto3.s3.transfer import TransferConfig
 from common import (
+    EPISODE_ID_INDEX,
+    get_dynamodb_resource,
+    get_s3_resource,
+    HTTP_SESSION,
     notify_cloudwatch,
     Payload,
     Status,
@@ -11,10 +16,37 @@ from common import (
     UploadInformation,
     VideoInformation,
 )
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-from pytube import YouTube
-from urllib import request
+from pytube import Stream, YouTube, request
+
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
+class ChunkStreamReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks, counts bytes read."""
+
+    def __init__(self, chunks) -> None:
+        self.chunks = iter(chunks)
+        self.pending = memoryview(b"")
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.pending:
+            self.pending = memoryview(next(self.chunks, b""))
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        self.bytes_read += size
+        return size
 
 
 class Downloader:
@@ -25,61 +57,108 @@ class Downloader:
         self.logger.setLevel(os.environ.get("LOGGING", logging.DEBUG))
         self.telegram = TelegramNotifier()
         self.storage_bucket_name = os.environ["STORAGE_BUCKET_NAME"]
-        self.storage_bucket = boto3.resource("s3").Bucket(self.storage_bucket_name)
+        # clients are thread-safe, resources are not; uploads run in parallel
+        self.s3_client = get_s3_resource().meta.client
         self.storage_table_name = os.environ["STORAGE_TABLE_NAME"]
-        self.storage_table = boto3.resource("dynamodb").Table(self.storage_table_name)
+        self.storage_table = get_dynamodb_resource().Table(self.storage_table_name)
+
+    def _open_video(self, url: str) -> YouTube:
+        self.logger.info("Downloading video from %s", url)
+        return YouTube(url)
 
-    def _populate_video_information(self, url: str):
-        self.logger.info(f"Downloading video from {url}")
-        yt = YouTube(url)
+    def _populate_video_information(self, youtube: YouTube, url: str):
         return VideoInformation(
-            video_id=yt.video_id,
-            title=yt.title,
-            author=yt.author,
-            description=yt.description,
-            thumbnail_url=yt.thumbnail_url,
-            duration_in_seconds=yt.length,
-            keywords=yt.keywords,
+            video_id=youtube.video_id,
+            title=youtube.title,
+            author=youtube.author,
+            description=youtube.description,
+            thumbnail_url=youtube.thumbnail_url,
+            duration_in_seconds=youtube.length,
+            keywords=youtube.keywords,
             source_url=url,
         )
 
-    def _is_existing_video(self, video_information: VideoInformation, chat_id: str):
-        self.logger.info(f"Is this new? {video_information}")
-        return self.storage_table.query(
-            KeyConditionExpression=Key("FeedId").eq(chat_id),
-            FilterExpression=Attr("EpisodeId").eq(video_information.video_id),
-        )["Items"]
+    def _is_existing_video(self, video_id: str, chat_id: str) -> bool:
+        self.logger.info("Is this new? %s", video_id)
+        return (
+            self.storage_table.query(
+                IndexName=EPISODE_ID_INDEX,
+                KeyConditionExpression=Key("FeedId").eq(chat_id)
+                & Key("EpisodeId").eq(video_id),
+                Select="COUNT",
+                Limit=1,
+            )["Count"]
+            > 0
+        )
 
-    def _download_audio_stream(self, video_information: VideoInformation) -> str:
+    def _select_audio_stream(self, youtube: YouTube) -> Stream:
         return (
-            YouTube(video_information.source_url)
-            .streams.filter(only_audio=True)
+            youtube.streams.filter(only_audio=True)
             .filter(subtype="mp4")
             .order_by("abr")
             .desc()
             .first()
-            .download(output_path="/tmp", filename=f"{video_information.video_id}.mp4")
         )
 
-    def _download_thumbnail(self, video_information: VideoInformation) -> str:
-        url_without_query_string = video_information.thumbnail_url.split("?")[0]
-        _, file_extension = os.path.splitext(url_without_query_string)
-        return request.urlretrieve(
-            url=video_information.thumbnail_url,
-            filename=f"/tmp/{video_information.video_id}_logo{file_extension}",
-        )[0]
+    def _upload_audio(self, audio_stream: Stream, bucket_path: str) -> int:
+        reader = ChunkStreamReader(request.stream(audio_stream.url))
+        self.s3_client.upload_fileobj(
+            io.BufferedReader(reader),
+            self.storage_bucket_name,
+            bucket_path,
+            Config=UPLOAD_TRANSFER_CONFIG,
+        )
+        return reader.bytes_read
 
-    def _upload_to_s3(
-        self, chat_id: str, audio_file_path: str, thumbnail_file_path: str
-    ):
-        audio_bucket_path = f"audio/{chat_id}/{os.path.basename(audio_file_path)}"
-        audio_file_size = Path(audio_file_path).stat().st_size
-        self.storage_bucket.upload_file(audio_file_path, audio_bucket_path)
+    def _upload_thumbnail(self, thumbnail_url: str, bucket_path: str) -> None:
+        with HTTP_SESSION.get(
+            thumbnail_url, stream=True, timeout=(1.0, 10.0)
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            self.s3_client.upload_fileobj(
+                response.raw,
+                self.storage_bucket_name,
+                bucket_path,
+                Config=UPLOAD_TRANSFER_CONFIG,
+            )
 
+    def _upload_to_s3(
+        self, chat_id: str, youtube: YouTube, video_information: VideoInformation
+    ) -> UploadInformation:
+        audio_bucket_path = f"audio/{chat_id}/{video_information.video_id}.mp4"
+        url_without_query_string = video_information.thumbnail_url.split("?")[0]
+        _, file_extension = os.path.splitext(url_without_query_string)
         thumbnail_bucket_path = (
-            f"audio/{chat_id}/{os.path.basename(thumbnail_file_path)}"
+            f"audio/{chat_id}/{video_information.video_id}_logo{file_extension}"
         )
-        self.storage_bucket.upload_file(thumbnail_file_path, thumbnail_bucket_path)
+        audio_stream = self._select_audio_stream(youtube)
+        # independent downloads from different hosts, both I/O bound
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            audio_upload = executor.submit(
+                self._upload_audio, audio_stream, audio_bucket_path
+            )
+            thumbnail_upload = executor.submit(
+                self._upload_thumbnail,
+                video_information.thumbnail_url,
+                thumbnail_bucket_path,
+            )
+        try:
+            audio_file_size = audio_upload.result()
+            thumbnail_upload.result()
+        except Exception:
+            # both uploads have finished here, don't leave half an episode behind
+            self.s3_client.delete_objects(
+                Bucket=self.storage_bucket_name,
+                Delete={
+                    "Objects": [
+                        {"Key": audio_bucket_path},
+                        {"Key": thumbnail_bucket_path},
+                    ],
+                    "Quiet": True,
+                },
+            )
+            raise
 
         now = datetime.utcnow()
         return UploadInformation(
@@ -96,40 +175,41 @@ class Downloader:
         upload_information: UploadInformation,
         video_information: VideoInformation,
     ) -> dict:
-        return dict(
-            [
-                ("FeedId", chat_id),
-                ("EpisodeId", video_information.video_id),
-                ("Title", video_information.title),
-                ("Author", video_information.author),
-                ("Description", video_information.description),
-                ("DurationInSeconds", video_information.duration_in_seconds),
-                ("Keywords", video_information.keywords[:250]),
-                ("FileLengthInByte", upload_information.episode_size),
-                ("BucketPathEpisode", upload_information.path_to_episode),
-                ("BucketPathThumbnail", upload_information.path_to_thumbnail),
-                ("TimestampUtc", str(upload_information.timestamp_utc)),
-                ("TimestampRfc822", upload_information.timestamp_rfc822),
-            ]
-        )
+        return {
+            "FeedId": chat_id,
+            "EpisodeId": video_information.video_id,
+            "Title": video_information.title,
+            "Author": video_information.author,
+            "Description": video_information.description,
+            "DurationInSeconds": video_information.duration_in_seconds,
+            "Keywords": video_information.keywords[:250],
+            "FileLengthInByte": upload_information.episode_size,
+            "BucketPathEpisode": upload_information.path_to_episode,
+            "BucketPathThumbnail": upload_information.path_to_thumbnail,
+            "TimestampUtc": str(upload_information.timestamp_utc),
+            "TimestampRfc822": upload_information.timestamp_rfc822,
+        }
 
     def _store_metadata(self, metadata: dict):
         self.storage_table.put_item(Item=metadata)
-        self.logger.info(f"Storing metadata: {metadata}")
+        self.logger.info("Storing metadata: %s", metadata)
 
     def handle_event(self, event):
         try:
-            self.logger.info(f"{self.__class__.__name__} - called with {event}")
+            self.logger.info("%s - called with %s", self.__class__.__name__, event)
             payload = Payload(**event["message"])
-            video_information = self._populate_video_information(payload.incoming_text)
-            if not self._is_existing_video(video_information, payload.chat_id):
+            youtube = self._open_video(payload.incoming_text)
+            # video_id is parsed from the url, no request to YouTube until metadata
+            if not self._is_existing_video(youtube.video_id, payload.chat_id):
+                video_information = self._populate_video_information(
+                    youtube, payload.incoming_text
+                )
                 self.telegram.send("...Downloading video.")
-                audio_file_path = self._download_audio_stream(video_information)
-                thumbnail_file_path = self._download_thumbnail(video_information)
+                self.telegram.send_chat_action()
                 upload_information = self._upload_to_s3(
                     chat_id=payload.chat_id,
-                    audio_file_path=audio_file_path,
-                    thumbnail_file_path=thumbnail_file_path,
+                    youtube=youtube,
+                    video_information=video_information,
                 )
                 metadata = self._create_cleansed_metadata(
                     video_information=video_information,
@@ -140,7 +220,7 @@ class Downloader:
                 status = Status.PODCASTER
             else:
                 self.telegram.send(
-                    f"...'{video_information.title}' is already in your cast. Skipping download.",
+                    f"...Video {youtube.video_id} is already in your cast. Skipping download.",
                 )
                 status = Status.FINISH
         except Exception as e:
@@ -150,6 +230,9 @@ class Downloader:
         return dict(status=status.name, message=event["message"])
 
 
+DOWNLOADER = Downloader()
+
+
 @notify_cloudwatch
 def downloader_handler(event, context) -> dict:
-    return Downloader().handle_event(event)
+    return DOWNLOADER.handle_event(event)
@@ -1,13 +1,39 @@
-import boto3
 import email
 import logging
 import os
-import tempfile
 from boto3.dynamodb.conditions import Key
-from common import Payload, TelegramNotifier, notify_cloudwatch, Status
+from common import (
+    get_dynamodb_resource,
+    get_s3_resource,
+    notify_cloudwatch,
+    Payload,
+    projection,
+    query_all,
+    Status,
+    TelegramNotifier,
+)
 from datetime import datetime
 from jinja2 import Environment, select_autoescape, FileSystemLoader
 
+FEED_EPISODE_LIMIT = 50  # podcast clients only show the most recent episodes
+FEED_ATTRIBUTES = (  # attributes referenced by podcast.xml.j2
+    "Title",
+    "Description",
+    "Author",
+    "Keywords",
+    "DurationInSeconds",
+    "TimestampRfc822",
+    "BucketPathEpisode",
+    "BucketPathThumbnail",
+)
+# Parsed once per container, templates don't change at runtime.
+JINJA_ENV = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
+    autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=False,
+)
+PODCAST_TEMPLATE = JINJA_ENV.get_template("podcast.xml.j2")
+
 
 class Podcaster:
     """Generates podcast feed and uploads to S3"""
@@ -17,23 +43,22 @@ class Podcaster:
         self.logger.setLevel(os.environ.get("LOGGING", logging.DEBUG))
         self.telegram = TelegramNotifier()
         self.storage_bucket_name = os.environ["STORAGE_BUCKET_NAME"]
-        self.storage_bucket = boto3.resource("s3").Bucket(self.storage_bucket_name)
+        self.storage_bucket = get_s3_resource().Bucket(self.storage_bucket_name)
         self.storage_table_name = os.environ["STORAGE_TABLE_NAME"]
-        self.storage_table = boto3.resource("dynamodb").Table(self.storage_table_name)
+        self.storage_table = get_dynamodb_resource().Table(self.storage_table_name)
         self.base_url = f'https://{os.environ["DISTRIBUTION_DOMAIN_NAME"]}'
-        self.jinja_env = Environment(
-            loader=FileSystemLoader("templates"),
-            autoescape=select_autoescape(["html", "xml"]),
-        )
 
-    def _retrieve_metadata(self, chat_id):
-        return self.storage_table.query(
-            KeyConditionExpression=Key("FeedId").eq(chat_id), ScanIndexForward=False
-        )["Items"]
+    def _retrieve_metadata(self, chat_id, limit: int = FEED_EPISODE_LIMIT):
+        return query_all(
+            self.storage_table,
+            limit=limit,
+            KeyConditionExpression=Key("FeedId").eq(chat_id),
+            ScanIndexForward=False,
+            **projection(*FEED_ATTRIBUTES),
+        )
 
     def _generate_rss_feed(self, metadata, feed_name):
-        template = self.jinja_env.get_template("podcast.xml.j2")
-        output = template.render(
+        output = PODCAST_TEMPLATE.render(
             dict(
                 podcast=dict(
                     last_build_date=email.utils.format_datetime(datetime.now()),
@@ -47,18 +72,16 @@ class Podcaster:
         return output
 
     def _upload_to_s3(self, feed_name: str, feed_content: str):
-        with tempfile.NamedTemporaryFile(mode="w") as tmp_file:
-            tmp_file.write(feed_content)
-            tmp_file.flush()
-            self.storage_bucket.upload_file(
-                Filename=tmp_file.name,
-                Key=feed_name,
-                ExtraArgs={"ContentType": "application/rss+xml"},
-            )
+        self.storage_bucket.put_object(
+            Key=feed_name,
+            Body=feed_content.encode("utf-8"),
+            ContentType="application/rss+xml",
+            CacheControl="max-age=60",
+        )
 
     def handle_event(self, event):
         try:
-            self.logger.info(f"{self.__class__.__name__} - called with {event}")
+            self.logger.info("%s - called with %s", self.__class__.__name__, event)
             payload = Payload(**event["message"])
             metadata = self._retrieve_metadata(payload.chat_id)
             feed_name = f"{payload.chat_id}.rss"
@@ -78,6 +101,9 @@ class Podcaster:
         return dict(status=status.name, message=event["message"])
 
 
+PODCASTER = Podcaster()
+
+
 @notify_cloudwatch
 def podcaster_handler(event, context) -> dict:
-    return Podcaster().handle_event(event)
+    return PODCASTER.handle_event(event)
@@ -0,0 +1,27 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import common
+
+# The handler modules build their clients and handler objects at import time.
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-central-1")
+os.environ.setdefault("STATE_MACHINE_ARN", "state_machine_arn")
+os.environ.setdefault("STORAGE_BUCKET_NAME", "storage_bucket_name")
+os.environ.setdefault("STORAGE_TABLE_NAME", "storage_table_name")
+os.environ.setdefault("DISTRIBUTION_DOMAIN_NAME", "distribution_domain_name")
+
+# Imported here with a stubbed SSM client, so the import-time parameter lookup
+# stays away from AWS. The test modules then get these modules from sys.modules.
+ssm_client = MagicMock()
+ssm_client.get_parameters.return_value = {
+    "Parameters": [
+        {"Name": common.SSM_PATH_TELEGRAM_API_TOKEN, "Value": "api_token"},
+        {"Name": common.SSM_PATH_TELEGRAM_CHAT_ID, "Value": "123456789"},
+    ]
+}
+with patch.object(common, "get_ssm_client", return_value=ssm_client):
+    import bouncer.bouncer  # noqa: F401
+    import commander.commander  # noqa: F401
+    import dispatcher.dispatcher  # noqa: F401
+    import downloader.downloader  # noqa: F401
+    import podcaster.podcaster  # noqa: F401
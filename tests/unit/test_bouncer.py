@@ -2,6 +2,7 @@ import json
 from unittest.mock import MagicMock
 
 import pytest
+from bouncer import bouncer as bouncer_module
 from bouncer.bouncer import Bouncer
 
 BASE_EVENT = """
@@ -83,6 +84,25 @@ def good_event_bad_chat():
     return event
 
 
+@pytest.fixture
+def non_text_event():
+    event = json.loads(BASE_EVENT)
+    base_message_json = json.loads(BASE_MESSAGE)
+    del base_message_json["message"]["text"]
+    base_message_json["message"]["sticker"] = {"file_id": "sticker"}
+    event["body"] = json.dumps(base_message_json)
+    return event
+
+
+@pytest.fixture
+def edited_message_event():
+    event = json.loads(BASE_EVENT)
+    base_message_json = json.loads(BASE_MESSAGE)
+    base_message_json["edited_message"] = base_message_json.pop("message")
+    event["body"] = json.dumps(base_message_json)
+    return event
+
+
 @pytest.fixture
 def bad_event():
     event = json.loads(BASE_EVENT)
@@ -91,12 +111,16 @@ def bad_event():
 
 
 @pytest.fixture()
-def bouncer():
+def bouncer(mocker):
+    mocker.patch.object(
+        bouncer_module,
+        "get_telegram_parameters",
+        return_value=MagicMock(chat_id=CHAT_ID_ALLOWED),
+    )
     the_object = Bouncer.__new__(Bouncer)
     the_object.sfn_client = MagicMock()
     the_object.logger = MagicMock()
     the_object.bot = MagicMock()
-    the_object.allowed_chat_id = CHAT_ID_ALLOWED
     return the_object
 
 
@@ -107,9 +131,9 @@ def test_should_process_good_event_and_start_state_machine(good_event, bouncer):
 
     bouncer._start_state_machine.assert_called_once_with(json.loads(PAYLOAD))
     assert result["statusCode"] == 200
-    assert result["body"] == json.dumps(
-        {"message": "Event received, state machine started."}
-    )
+    assert json.loads(result["body"]) == {
+        "message": "Event received, state machine started."
+    }
 
 
 def test_return_error_message_on_bad_event(bad_event, bouncer):
@@ -142,3 +166,23 @@ def test_should_extract_payload_from_incoming_message(good_event, bouncer):
     result = bouncer._create_payload(event_body)
 
     assert result == json.loads(PAYLOAD)
+
+
+def test_should_ignore_non_text_message(non_text_event, bouncer):
+    bouncer._start_state_machine = MagicMock()
+
+    result = bouncer.handle_event(non_text_event)
+
+    bouncer._start_state_machine.assert_not_called()
+    assert result["statusCode"] == 200
+    assert json.loads(result["body"])["message"] == "Event ignored."
+
+
+def test_should_ignore_edited_message(edited_message_event, bouncer):
+    bouncer._start_state_machine = MagicMock()
+
+    result = bouncer.handle_event(edited_message_event)
+
+    bouncer._start_state_machine.assert_not_called()
+    assert result["statusCode"] == 200
+    assert json.loads(result["body"])["message"] == "Event ignored."
@@ -1,4 +1,5 @@
 import json
+from datetime import timedelta
 from unittest.mock import MagicMock
 
 import pytest
@@ -26,12 +27,14 @@ METADATA = [
         Title="123456789012345678901234567890",
         TimestampUtc=1644796800,  # 02/14/2022, 12:00:00 am
         BucketPathEpisode="foo/bar/baz",
+        BucketPathThumbnail="foo/bar/baz.jpg",
         EpisodeId="id123",
     ),
     dict(
         Title="abcdefghijklmnopqrstuvwxyz",
         TimestampUtc=1644883200,  # 02/15/2022, 12:00:00 am
         BucketPathEpisode="baz/foo/bar",
+        BucketPathThumbnail="baz/foo/bar.jpg",
         EpisodeId="idabc",
     ),
 ]
@@ -133,6 +136,32 @@ def test_should_process_listfull_command(commander, listfull_command, freezer):
     assert "-1 day, 0:00:00" in args[0]
 
 
+def test_should_limit_list_command(commander, list_command, freezer):
+    list_command["message"]["incoming_text"] = "/listfull 1"
+    commander._query_episodes = MagicMock(return_value=METADATA[:1])
+
+    result = commander.handle_event(list_command)
+
+    assert result["status"] == Status.FINISH.name
+    commander._query_episodes.assert_called_once_with(
+        feed_id="123456", ascending=False, limit=1
+    )
+    _, args, _ = commander.telegram.mock_calls[0]
+    assert "123456789012345678901234567890" in args[0]
+
+
+@pytest.mark.parametrize("command", ["/list ten", "/list 0", "/list ²", "/list 1 2"])
+def test_should_reject_invalid_list_limit(commander, list_command, command):
+    list_command["message"]["incoming_text"] = command
+    commander._query_episodes = MagicMock()
+
+    result = commander.handle_event(list_command)
+
+    assert result["status"] == Status.FINISH.name
+    commander._query_episodes.assert_not_called()
+    commander.telegram.send.assert_called_once_with(f"I don't understand '{command}'.")
+
+
 def test_should_process_correct_delete_command(commander, delete_command):
     commander._delete_episode = MagicMock()
 
@@ -162,6 +191,9 @@ def test_should_process_deletefirst_command(commander, deletefirst_command):
     result = commander.handle_event(deletefirst_command)
 
     assert result["status"] == Status.PODCASTER.name
+    commander._query_episodes.assert_called_once_with(
+        feed_id="123456", ascending=False, limit=1, attributes=("EpisodeId",)
+    )
     commander._delete_episode.assert_called_once_with(
         chat_id="123456", episode_id="id123"
     )
@@ -174,6 +206,69 @@ def test_should_process_deletelast_command(commander, deletelast_command):
     result = commander.handle_event(deletelast_command)
 
     assert result["status"] == Status.PODCASTER.name
+    commander._query_episodes.assert_called_once_with(
+        feed_id="123456", ascending=True, limit=1, attributes=("EpisodeId",)
+    )
     commander._delete_episode.assert_called_once_with(
         chat_id="123456", episode_id="id123"
     )
+
+
+def test_should_delete_episode_files_in_one_request(commander):
+    commander.storage_table = MagicMock()
+    commander.storage_table.query.return_value = {"Items": METADATA[:1]}
+    commander.storage_bucket = MagicMock()
+
+    result = commander._delete_episode(chat_id="123456", episode_id="id123")
+
+    assert result == "Episode id123 deleted."
+    _, kwargs = commander.storage_table.query.call_args
+    assert kwargs["IndexName"] == "EpisodeIdIndex"
+    assert kwargs["Limit"] == 1
+    commander.storage_bucket.delete_objects.assert_called_once_with(
+        Delete={
+            "Objects": [{"Key": "foo/bar/baz.jpg"}, {"Key": "foo/bar/baz"}],
+            "Quiet": True,
+        }
+    )
+
+
+def test_should_report_unknown_episode_on_delete(commander):
+    commander.storage_table = MagicMock()
+    commander.storage_table.query.return_value = {"Items": []}
+    commander.storage_bucket = MagicMock()
+
+    result = commander._delete_episode(chat_id="123456", episode_id="unknown")
+
+    assert "Couldn't find episode" in result
+    commander.storage_bucket.delete_objects.assert_not_called()
+
+
+def test_should_format_age_like_timedelta(commander):
+    for seconds in (0, 59, 3600, 86399, 86400, 90061, 2 * 86400, -5):
+        assert commander._format_age(seconds) == str(timedelta(seconds=seconds))
+
+
+def test_should_reply_to_unknown_command(commander, help_command):
+    help_command["message"]["incoming_text"] = "/deleteall"
+    commander._delete_episode = MagicMock()
+
+    result = commander.handle_event(help_command)
+
+    assert result["status"] == Status.FINISH.name
+    commander._delete_episode.assert_not_called()
+    commander.telegram.send.assert_called_once_with(
+        "I don't understand '/deleteall'. Try /help."
+    )
+
+
+def test_should_query_episodes_with_projection(commander):
+    commander.storage_table = MagicMock()
+    commander.storage_table.query.return_value = {"Items": METADATA}
+
+    commander._query_episodes("123456", ascending=True, attributes=("EpisodeId",))
+
+    _, kwargs = commander.storage_table.query.call_args
+    assert kwargs["ProjectionExpression"] == "#EpisodeId"
+    assert kwargs["ExpressionAttributeNames"] == {"#EpisodeId": "EpisodeId"}
+    assert "Limit" not in kwargs
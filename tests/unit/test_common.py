@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock
+
+import pytest
+from commonlayer import common
+
+API_TOKEN = "api_token"
+CHAT_ID = "123456789"
+
+
+@pytest.fixture
+def ssm_client(mocker):
+    client = MagicMock()
+    client.get_parameters.return_value = {
+        "Parameters": [
+            {"Name": common.SSM_PATH_TELEGRAM_CHAT_ID, "Value": CHAT_ID},
+            {"Name": common.SSM_PATH_TELEGRAM_API_TOKEN, "Value": API_TOKEN},
+        ]
+    }
+    mocker.patch.object(common, "get_ssm_client", return_value=client)
+    common._read_telegram_parameters.cache_clear()
+    yield client
+    common._read_telegram_parameters.cache_clear()
+
+
+def test_should_read_telegram_parameters_once(ssm_client):
+    first = common.get_telegram_parameters()
+    second = common.get_telegram_parameters()
+
+    assert first == second == (API_TOKEN, CHAT_ID)
+    ssm_client.get_parameters.assert_called_once_with(
+        Names=[common.SSM_PATH_TELEGRAM_API_TOKEN, common.SSM_PATH_TELEGRAM_CHAT_ID],
+        WithDecryption=True,
+    )
+
+
+def test_should_read_telegram_parameters_again_after_ttl(ssm_client, mocker):
+    monotonic = mocker.patch.object(common.time, "monotonic", return_value=0.0)
+    common.get_telegram_parameters()
+    monotonic.return_value = common.SSM_CACHE_TTL_SECONDS - 1.0
+    common.get_telegram_parameters()
+    monotonic.return_value = float(common.SSM_CACHE_TTL_SECONDS)
+    common.get_telegram_parameters()
+
+    assert ssm_client.get_parameters.call_count == 2
+
+
+@pytest.fixture
+def telegram(mocker):
+    mocker.patch.object(
+        common,
+        "get_telegram_parameters",
+        return_value=common.TelegramParameters(api_token=API_TOKEN, chat_id=CHAT_ID),
+    )
+    mocker.patch.object(common, "HTTP_SESSION")
+    return common.TelegramNotifier()
+
+
+def test_should_send_message_as_json(telegram):
+    telegram.send("hello", disable_notification=False)
+
+    _, kwargs = common.HTTP_SESSION.post.call_args
+    assert kwargs["url"] == f"https://api.telegram.org/bot{API_TOKEN}/sendmessage"
+    assert kwargs["headers"] == {"Content-Type": "application/json"}
+    assert common.orjson.loads(kwargs["data"]) == {
+        "chat_id": CHAT_ID,
+        "parse_mode": "HTML",
+        "disable_web_page_preview": True,
+        "disable_notification": False,
+        "text": "hello",
+    }
+
+
+def test_should_send_message_without_chat_action(telegram):
+    telegram.send("hello")
+
+    common.HTTP_SESSION.post.assert_called_once()
+
+
+def test_should_format_urls_once_per_token(telegram):
+    common.TelegramNotifier._url.cache_clear()
+
+    telegram.send("hello")
+    telegram.send("hello again")
+    common.get_telegram_parameters.return_value = common.TelegramParameters(
+        api_token="rotated", chat_id=CHAT_ID
+    )
+    telegram.send("hello rotated")
+
+    assert common.TelegramNotifier._url.cache_info().misses == 2
+    _, kwargs = common.HTTP_SESSION.post.call_args
+    assert kwargs["url"] == "https://api.telegram.org/botrotated/sendmessage"
+
+
+def test_should_build_projection_with_attribute_names():
+    assert common.projection("Title", "Keywords") == {
+        "ProjectionExpression": "#Title, #Keywords",
+        "ExpressionAttributeNames": {"#Title": "Title", "#Keywords": "Keywords"},
+    }
+
+
+def test_should_query_all_pages_without_limit():
+    table = MagicMock()
+    table.query.side_effect = [
+        {"Items": [1, 2], "LastEvaluatedKey": {"TimestampUtc": 2}},
+        {"Items": [3]},
+    ]
+
+    items = common.query_all(table, KeyConditionExpression="condition")
+
+    assert items == [1, 2, 3]
+    first_call, second_call = table.query.call_args_list
+    assert "Limit" not in first_call.kwargs
+    assert second_call.kwargs["ExclusiveStartKey"] == {"TimestampUtc": 2}
+
+
+def test_should_retry_telegram_posts_on_server_errors():
+    retries = common.HTTP_SESSION.get_adapter("https://api.telegram.org").max_retries
+
+    assert retries.is_retry("POST", 429)
+    assert retries.is_retry("POST", 503)
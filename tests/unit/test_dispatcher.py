@@ -15,9 +15,20 @@ BASE_PAYLOAD = """
 }
 """
 
-PAYLOAD_VIDEO_URL_1 = "https://youtu.be/123456"
+PAYLOAD_VIDEO_URL_1 = "https://youtu.be/OCJMEmQPvSU"
 PAYLOAD_VIDEO_URL_2 = "https://www.youtube.com/watch?v=0CmtDk-joT4"
 PAYLOAD_VIDEO_URL_3 = "https://youtube.com/shorts/OCJMEmQPvSU?feature=share'"
+PAYLOAD_VIDEO_URL_4 = "https://www.youtube.com/watch?feature=share&v=0CmtDk-joT4"
+PAYLOAD_VIDEO_URL_5 = "https://m.youtube.com/watch?v=0CmtDk-joT4"
+PAYLOAD_VIDEO_URL_6 = "https://www.youtube.com/live/0CmtDk-joT4?feature=share"
+PAYLOAD_VIDEO_URL_7 = "https://youtube.com/embed/OCJMEmQPvSU"
+PAYLOAD_NON_VIDEO_URLS = (
+    "https://youtu.be/123456",
+    "https://www.youtube.com/",
+    "https://www.youtube.com/channel/UC_x5XG1OV2P6uZZ5FSM9Ttw",
+    "https://notyoutube.com/watch?v=0CmtDk-joT4",
+    "https://mm.youtube.com/watch?v=0CmtDk-joT4",
+)
 PAYLOAD_FREE_TEXT = "hello"
 PAYLOAD_COMMAND_1 = "/help"
 
@@ -68,9 +79,19 @@ def test_should_process_unknown_message(unknown_message, dispatcher):
     result = dispatcher.handle_event(unknown_message)
 
     assert result["status"] == Status.FINISH.name
+    dispatcher._send_telegram.assert_called_once()
 
 
 def test_should_recognize_different_video_urls(dispatcher):
     assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_1)
     assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_2)
     assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_3)
+    assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_4)
+    assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_5)
+    assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_6)
+    assert dispatcher._is_video_url(PAYLOAD_VIDEO_URL_7)
+
+
+def test_should_not_recognize_non_video_urls(dispatcher):
+    for url in PAYLOAD_NON_VIDEO_URLS:
+        assert not dispatcher._is_video_url(url)
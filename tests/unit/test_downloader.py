@@ -1,8 +1,10 @@
+import dataclasses
+import io
 import json
 from unittest.mock import MagicMock
 
 import pytest
-from downloader.downloader import Downloader
+from downloader.downloader import ChunkStreamReader, Downloader
 from commonlayer.common import (
     Status,
     UploadInformation,
@@ -62,41 +64,106 @@ def downloader():
 
 def test_should_process_video_if_new(base_message, video_information, downloader):
     downloader._is_existing_video = MagicMock(return_value=False)
+    downloader._open_video = MagicMock()
     downloader._populate_video_information = MagicMock(return_value=video_information)
-    downloader._download_audio_stream = MagicMock()
-    downloader._download_thumbnail = MagicMock()
     downloader._upload_to_s3 = MagicMock()
     downloader._store_metadata = MagicMock()
 
     result = downloader.handle_event(base_message)
 
     assert result["status"] == Status.PODCASTER.name
-    downloader._download_audio_stream.assert_called_once()
-    downloader._download_thumbnail.assert_called_once()
-    downloader._upload_to_s3.assert_called_once()
+    downloader._open_video.assert_called_once_with("https://youtu.be/123456")
+    downloader.telegram.send_chat_action.assert_called_once()
+    downloader._upload_to_s3.assert_called_once_with(
+        chat_id="123456",
+        youtube=downloader._open_video.return_value,
+        video_information=video_information,
+    )
     downloader._store_metadata.assert_called_once()
 
 
 def test_should_ignore_video_if_not_new(base_message, downloader):
     downloader._is_existing_video = MagicMock(return_value=True)
+    downloader._open_video = MagicMock()
     downloader._populate_video_information = MagicMock()
-    downloader._download_to_tmp = MagicMock()
     downloader._upload_to_s3 = MagicMock()
     downloader._store_metadata = MagicMock()
 
     result = downloader.handle_event(base_message)
 
     assert result["status"] == Status.FINISH.name
-    downloader._download_to_tmp.assert_not_called()
+    downloader._populate_video_information.assert_not_called()
     downloader._upload_to_s3.assert_not_called()
     downloader._store_metadata.assert_not_called()
 
 
 def test_should_cleanse_metadata(downloader, video_information, upload_information):
-    video_information = video_information._replace(keywords="x" * 300)
+    video_information = dataclasses.replace(video_information, keywords="x" * 300)
 
     metadata = downloader._create_cleansed_metadata(
         ANY_CHAT_ID, upload_information, video_information
     )
 
     assert len(metadata["Keywords"]) == 250
+
+
+def test_should_read_chunks_as_file_object():
+    reader = ChunkStreamReader(iter([b"abc", b"defg", b"h"]))
+
+    content = io.BufferedReader(reader, buffer_size=2).read()
+
+    assert content == b"abcdefgh"
+    assert reader.bytes_read == 8
+
+
+def test_should_upload_audio_and_thumbnail(downloader, video_information, mocker):
+    downloader.storage_bucket_name = "bucket"
+    downloader.s3_client = MagicMock()
+    downloader.s3_client.upload_fileobj.side_effect = (
+        lambda fileobj, bucket, key, Config: (fileobj.read())
+    )
+    downloader._select_audio_stream = MagicMock()
+    mocker.patch("downloader.downloader.request.stream", return_value=[b"audio"])
+    mocker.patch("downloader.downloader.HTTP_SESSION")
+    video_information = dataclasses.replace(
+        video_information, thumbnail_url="https://host/thumbnail.jpg?query"
+    )
+
+    upload_information = downloader._upload_to_s3(
+        ANY_CHAT_ID, MagicMock(), video_information
+    )
+
+    assert upload_information.path_to_episode == f"audio/{ANY_CHAT_ID}/video_id.mp4"
+    assert (
+        upload_information.path_to_thumbnail == f"audio/{ANY_CHAT_ID}/video_id_logo.jpg"
+    )
+    assert upload_information.episode_size == 5
+    assert downloader.s3_client.upload_fileobj.call_count == 2
+    downloader.s3_client.delete_objects.assert_not_called()
+
+
+def test_should_remove_uploads_if_one_fails(downloader, video_information, mocker):
+    downloader.storage_bucket_name = "bucket"
+    downloader.s3_client = MagicMock()
+    downloader._upload_audio = MagicMock(side_effect=IOError("stream broke"))
+    downloader._upload_thumbnail = MagicMock()
+
+    with pytest.raises(IOError):
+        downloader._upload_to_s3(ANY_CHAT_ID, MagicMock(), video_information)
+
+    downloader._upload_thumbnail.assert_called_once()
+    _, kwargs = downloader.s3_client.delete_objects.call_args
+    assert kwargs["Delete"]["Objects"] == [
+        {"Key": f"audio/{ANY_CHAT_ID}/video_id.mp4"},
+        {"Key": f"audio/{ANY_CHAT_ID}/video_id_logo"},
+    ]
+
+
+def test_should_check_for_existing_video_via_index(downloader):
+    downloader.storage_table = MagicMock()
+    downloader.storage_table.query.return_value = {"Count": 1, "Items": []}
+
+    assert downloader._is_existing_video("video_id", ANY_CHAT_ID)
+    _, kwargs = downloader.storage_table.query.call_args
+    assert kwargs["IndexName"] == "EpisodeIdIndex"
+    assert kwargs["Select"] == "COUNT"
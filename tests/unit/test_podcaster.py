@@ -31,7 +31,6 @@ def podcaster():
     the_object.logger = MagicMock()
     the_object.storage_bucket = MagicMock()
     the_object.storage_table = MagicMock()
-    the_object.jinja_env = MagicMock()
     the_object.base_url = "feed.url"
     return the_object
 
@@ -47,3 +46,51 @@ def test_should_generate_feed(base_message, podcaster):
     podcaster._retrieve_metadata.assert_called_once()
     podcaster._generate_rss_feed.assert_called_once_with(ANY_METADATA, "123456.rss")
     podcaster._upload_to_s3.assert_called_once_with("123456.rss", ANY_RSS)
+
+
+def test_should_retrieve_metadata_across_pages_up_to_limit(podcaster):
+    podcaster.storage_table.query.side_effect = [
+        {"Items": [1, 2], "LastEvaluatedKey": "key"},
+        {"Items": [3], "LastEvaluatedKey": "other_key"},
+    ]
+
+    metadata = podcaster._retrieve_metadata("123456", limit=3)
+
+    assert metadata == [1, 2, 3]
+    first_call, second_call = podcaster.storage_table.query.call_args_list
+    assert first_call.kwargs["Limit"] == 3
+    assert second_call.kwargs["Limit"] == 1
+    assert second_call.kwargs["ExclusiveStartKey"] == "key"
+
+
+def test_should_render_feed_from_preloaded_template(podcaster):
+    feed = podcaster._generate_rss_feed(
+        [
+            dict(
+                Title="Title & more",
+                Description="description",
+                BucketPathEpisode="audio/123456/episode.mp4",
+                BucketPathThumbnail="audio/123456/episode_logo.jpg",
+                TimestampRfc822="Mon, 14 Feb 2022 00:00:00 -0000",
+                DurationInSeconds=123,
+                Keywords=["keyword"],
+                Author="author",
+            )
+        ],
+        "123456.rss",
+    )
+
+    assert '<atom:link href="feed.url/123456.rss"' in feed
+    assert "<title>Title &amp; more</title>" in feed
+    assert "feed.url/audio/123456/episode.mp4" in feed
+
+
+def test_should_upload_feed_from_memory(podcaster):
+    podcaster._upload_to_s3("123456.rss", "<rss/>")
+
+    podcaster.storage_bucket.put_object.assert_called_once_with(
+        Key="123456.rss",
+        Body=b"<rss/>",
+        ContentType="application/rss+xml",
+        CacheControl="max-age=60",
+    )